@@ -1,10 +1,120 @@
 // Vercel Serverless Function (Node.js) - CORS Proxy for DCL nodes
 
+import http from 'node:http';
+import https from 'node:https';
+
+// Module-level keep-alive agents so warm invocations reuse sockets to the
+// same DCL node instead of opening a new TCP (+TLS) connection per RPC call
+const AGENT_OPTIONS = { keepAlive: true, maxSockets: 64, maxFreeSockets: 64 };
+const httpAgent = new http.Agent(AGENT_OPTIONS);
+const httpsAgent = new https.Agent(AGENT_OPTIONS);
+
+// Dead hosts should fail well before the browser's 10s abort, and a refused
+// connection should be distinguishable from one that never answered
+const CONNECT_TIMEOUT = 3000;
+const READ_TIMEOUT = 8000;
+
+// The only POST the explorer makes is a batched status/abci_info/net_info
+// call to a node's JSON-RPC root. Anything else is refused so the proxy
+// can't be used to POST arbitrary payloads to arbitrary APIs.
+const RPC_BATCH_METHODS = new Set(['status', 'abci_info', 'net_info']);
+const MAX_BATCH_BYTES = 1024;
+
+// Normalized JSON-RPC batch to forward, or null if the request isn't one
+function rpcBatchBody(apiUrl, rawBody) {
+  let url;
+  try {
+    url = new URL(apiUrl);
+  } catch (error) {
+    return null;
+  }
+  if (url.pathname !== '/' || url.search) return null;
+
+  let text;
+  if (Buffer.isBuffer(rawBody)) text = rawBody.toString();
+  else if (typeof rawBody === 'string') text = rawBody;
+  else text = JSON.stringify(rawBody ?? null);
+  if (Buffer.byteLength(text) > MAX_BATCH_BYTES) return null;
+
+  let batch;
+  try {
+    batch = JSON.parse(text);
+  } catch (error) {
+    return null;
+  }
+  const valid = Array.isArray(batch)
+    && batch.length > 0
+    && batch.length <= RPC_BATCH_METHODS.size
+    && batch.every((call) => call
+      && call.jsonrpc === '2.0'
+      && (typeof call.id === 'number' || typeof call.id === 'string')
+      && RPC_BATCH_METHODS.has(call.method));
+  if (!valid) return null;
+  return JSON.stringify(batch.map(({ id, method }) => ({ jsonrpc: '2.0', id, method, params: {} })));
+}
+
+function timeoutError(message) {
+  return Object.assign(new Error(message), { code: 'ETIMEDOUT' });
+}
+
+function forward(apiUrl, method, body, retried = false) {
+  return new Promise((resolve, reject) => {
+    const url = new URL(apiUrl);
+    const isHttps = url.protocol === 'https:';
+    const headers = {
+      'User-Agent': 'DCL-Network-Explorer/1.0',
+      'Accept': 'application/json',
+      // Compressed bodies are relayed untouched; the browser inflates them
+      'Accept-Encoding': 'gzip',
+      'Connection': 'keep-alive',
+    };
+    if (body) {
+      // Batched JSON-RPC calls are POSTed to the node's root endpoint
+      headers['Content-Type'] = 'application/json';
+      headers['Content-Length'] = Buffer.byteLength(body);
+    }
+    const upstream = (isHttps ? https : http).request(url, {
+      method,
+      agent: isHttps ? httpsAgent : httpAgent,
+      headers,
+    }, (response) => {
+      const chunks = [];
+      response.on('data', (chunk) => chunks.push(chunk));
+      response.on('end', () => resolve({
+        status: response.statusCode,
+        contentType: response.headers['content-type'],
+        contentEncoding: response.headers['content-encoding'],
+        // Relayed as raw bytes; the proxy never needs to decode the JSON
+        body: Buffer.concat(chunks),
+      }));
+      response.on('error', reject);
+    });
+    upstream.on('socket', (socket) => {
+      if (!socket.connecting) return; // reused keep-alive socket
+      const timer = setTimeout(() => upstream.destroy(timeoutError('Connect timeout')), CONNECT_TIMEOUT);
+      socket.once('connect', () => clearTimeout(timer));
+      socket.once('close', () => clearTimeout(timer));
+    });
+    upstream.setTimeout(READ_TIMEOUT, () => upstream.destroy(timeoutError('Read timeout')));
+    upstream.on('error', (error) => {
+      // A pooled socket can be closed by the node while this instance was
+      // frozen; retry once on a fresh connection rather than reporting 502
+      if (!retried && upstream.reusedSocket && error.code === 'ECONNRESET') {
+        resolve(forward(apiUrl, method, body, true));
+      } else {
+        reject(error);
+      }
+    });
+    upstream.end(body);
+  });
+}
+
 export default async function handler(req, res) {
   // CORS headers
   res.setHeader('Access-Control-Allow-Origin', '*');
   res.setHeader('Access-Control-Allow-Methods', 'GET, POST, OPTIONS');
   res.setHeader('Access-Control-Allow-Headers', 'Content-Type');
+  res.setHeader('Access-Control-Expose-Headers', 'X-Proxy-Error');
 
   // Handle CORS preflight
   if (req.method === 'OPTIONS') {
@@ -17,20 +127,31 @@ export default async function handler(req, res) {
     return res.status(400).json({ error: 'Missing apiurl parameter' });
   }
 
-  try {
-    const response = await fetch(apiUrl, {
-      method: req.method,
-      headers: {
-        'User-Agent': 'DCL-Network-Explorer/1.0',
-        'Accept': 'application/json',
-      },
-    });
+  if (req.method !== 'GET' && req.method !== 'POST') {
+    return res.status(405).json({ error: 'Method not allowed' });
+  }
 
-    const body = await response.text();
+  let body;
+  if (req.method === 'POST') {
+    body = rpcBatchBody(apiUrl, req.body);
+    if (!body) {
+      return res.status(400).json({ error: 'POST is only allowed for status/abci_info/net_info JSON-RPC batches' });
+    }
+  }
+
+  try {
+    const response = await forward(apiUrl, req.method, body);
 
-    res.setHeader('Content-Type', response.headers.get('Content-Type') || 'application/json');
-    return res.status(response.status).send(body);
+    res.setHeader('Content-Type', response.contentType || 'application/json');
+    if (response.contentEncoding) {
+      res.setHeader('Content-Encoding', response.contentEncoding);
+    }
+    return res.status(response.status).send(response.body);
   } catch (error) {
-    return res.status(502).json({ error: error.message });
+    // 504 for timeouts, 502 for refused/unresolvable hosts. The header tells
+    // the client this came from the proxy and not from the node itself.
+    const status = error.code === 'ETIMEDOUT' ? 504 : 502;
+    res.setHeader('X-Proxy-Error', error.code || 'ERROR');
+    return res.status(status).json({ error: error.message, code: error.code });
   }
 }